@@ -1,8 +1,10 @@
 import csv
-import json
+import orjson
 import sqlite3
 import threading
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import numpy as np
 from faker import Faker
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
@@ -14,87 +16,167 @@ fake = Faker()
 
 # -------------------------------------------------------
 # Gera N registros fake
+# O Faker só é chamado para montar pools de valores; as N linhas
+# são sorteadas desses pools com NumPy (uma chamada por coluna).
+# Retorna as colunas (ids, nomes, emails, idades, cidades).
 # -------------------------------------------------------
+CAMPOS = ("id", "nome", "email", "idade", "cidade")
+TAMANHO_POOL = 50_000
+
+
+def _pool(gerador, tamanho, callback=None, inicio=0, total=0):
+    # Progresso só a cada 1% (no máximo ~100 atualizações da interface)
+    passo = max(1, total // 100)
+    pool = []
+    for i in range(tamanho):
+        pool.append(gerador())
+        feitos = inicio + i + 1
+        if callback and (feitos % passo == 0 or feitos == total):
+            callback(feitos, total)
+    return np.array(pool, dtype=object)
+
+
+def _amostrar(pool, qtd, rng):
+    # Com qtd <= tamanho do pool, o próprio pool já é a coluna
+    if qtd <= len(pool):
+        return pool
+    return pool[rng.integers(0, len(pool), qtd)]
+
+
+def _gerar_numericos(qtd, rng):
+    # Colunas numéricas preenchidas direto em arrays NumPy (sem laço em Python)
+    ids = np.arange(1, qtd + 1, dtype=np.int64)
+    idades = rng.integers(18, 71, qtd, dtype=np.int32)
+    return ids, idades
+
+
 def gerar_dados(qtd, callback=None):
-    dados = []
-    for i in range(qtd):
-        dados.append({
-            "id": i + 1,
-            "nome": fake.name(),
-            "email": fake.email(),
-            "idade": fake.random_int(18, 70),
-            "cidade": fake.city()
-        })
-        # Atualiza progresso
-        if callback:
-            callback(i + 1, qtd)
-    return dados
+    rng = np.random.default_rng()
+    tamanho = min(qtd, TAMANHO_POOL)
+
+    # O progresso acompanha a montagem dos três pools do Faker
+    total = 3 * tamanho
+    ids, idades = _gerar_numericos(qtd, rng)
+    nomes = _amostrar(_pool(fake.name, tamanho, callback, 0, total), qtd, rng)
+    emails = _amostrar(_pool(fake.email, tamanho, callback, tamanho, total), qtd, rng)
+    cidades = _amostrar(_pool(fake.city, tamanho, callback, 2 * tamanho, total), qtd, rng)
+
+    return ids, nomes, emails, idades, cidades
+
+
+# -------------------------------------------------------
+# Escritores de cada formato
+# Recebem as colunas como listas Python e o caminho do arquivo a gravar
+# -------------------------------------------------------
+TAMANHO_BUFFER = 1 << 20  # 1 MiB por arquivo: menos syscalls de write()
+
+
+def _escrever_sqlite(colunas, caminho):
+    # isolation_level=None: a transação é controlada explicitamente (BEGIN/COMMIT)
+    conn = sqlite3.connect(caminho, isolation_level=None)
+    try:
+        # Carga em lote: journal em memória e sem fsync durante a inserção
+        conn.executescript(
+            "PRAGMA journal_mode=MEMORY;"
+            "PRAGMA synchronous=OFF;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA cache_size=-100000;"
+        )
+        cur = conn.cursor()
+        cur.execute("BEGIN")
+        cur.execute("""CREATE TABLE IF NOT EXISTS pessoas (
+                        id INTEGER PRIMARY KEY,
+                        nome TEXT,
+                        email TEXT,
+                        idade INTEGER,
+                        cidade TEXT
+                    )""")
+        cur.executemany(
+            "INSERT INTO pessoas (id, nome, email, idade, cidade) VALUES (?, ?, ?, ?, ?)",
+            zip(*colunas)
+        )
+        cur.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def _escrever_csv(colunas, caminho):
+    with open(caminho, "w", newline="", encoding="utf-8", buffering=TAMANHO_BUFFER) as f:
+        writer = csv.writer(f)
+        writer.writerow(CAMPOS)
+        writer.writerows(zip(*colunas))
+
+
+def _escrever_json(colunas, caminho):
+    # Array escrito manualmente, registro a registro
+    with open(caminho, "wb", buffering=TAMANHO_BUFFER) as f:
+        f.write(b"[")
+        separador = b""
+        for valores in zip(*colunas):
+            f.write(separador)
+            f.write(orjson.dumps(dict(zip(CAMPOS, valores))))
+            separador = b","
+        f.write(b"]")
+
+
+def _escrever_toon(colunas, caminho):
+    # Colunas já formatadas como texto e um único join/write para o arquivo todo
+    ids, nomes, emails, idades, cidades = colunas
+    corpo = "\n".join(map("|".join, zip(map(str, ids), nomes, emails, map(str, idades), cidades)))
+    with open(caminho, "w", encoding="utf-8", buffering=TAMANHO_BUFFER) as f:
+        f.write("|".join(CAMPOS) + "\n")
+        f.write(corpo)
+        f.write("\n")
+
+
+# (nome, arquivo, escritor), na ordem da mensagem final
+ESCRITORES = (
+    ("SQLite", "dados.sqlite", _escrever_sqlite),
+    ("CSV", "dados.csv", _escrever_csv),
+    ("JSON", "dados.json", _escrever_json),
+    ("TOON", "dados.toon", _escrever_toon),
+)
+
+
+def _gravar(fn, colunas, temporario):
+    # Sempre parte de um arquivo novo (o SQLite não herda tabela de outra execução)
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    fn(colunas, temporario)
+    return os.path.getsize(temporario)
 
 
 # -------------------------------------------------------
 # Exportação em todos os formatos (com progresso)
+# Os quatro arquivos são gravados em paralelo, com nomes temporários;
+# os arquivos finais só são substituídos se todos derem certo
 # -------------------------------------------------------
-def exportar_todos(dados, pasta_saida, callback):
-    tamanhos = {}
+def exportar_todos(colunas, pasta_saida, callback):
+    etapas = len(ESCRITORES)
+    # .tolist() converte os tipos NumPy para int/str do Python uma única vez
+    colunas = [c.tolist() for c in colunas]
+    temporarios = {nome: os.path.join(pasta_saida, arquivo + ".tmp")
+                   for nome, arquivo, _ in ESCRITORES}
 
-    etapas = 4  # SQLite, CSV, JSON, TOON
-    etapa_atual = 0
-
-    # --- SQLite ---
-    etapa_atual += 1
-    callback(etapa_atual, etapas)
-
-    sqlite_path = os.path.join(pasta_saida, "dados.sqlite")
-    conn = sqlite3.connect(sqlite_path)
-    cur = conn.cursor()
-    cur.execute("""CREATE TABLE IF NOT EXISTS pessoas (
-                    id INTEGER PRIMARY KEY,
-                    nome TEXT,
-                    email TEXT,
-                    idade INTEGER,
-                    cidade TEXT
-                )""")
-    cur.executemany(
-        "INSERT INTO pessoas (id, nome, email, idade, cidade) VALUES (:id, :nome, :email, :idade, :cidade)",
-        dados
-    )
-    conn.commit()
-    conn.close()
-    tamanhos["SQLite"] = os.path.getsize(sqlite_path)
-
-    # --- CSV ---
-    etapa_atual += 1
-    callback(etapa_atual, etapas)
-
-    csv_path = os.path.join(pasta_saida, "dados.csv")
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=dados[0].keys())
-        writer.writeheader()
-        writer.writerows(dados)
-    tamanhos["CSV"] = os.path.getsize(csv_path)
-
-    # --- JSON ---
-    etapa_atual += 1
-    callback(etapa_atual, etapas)
-
-    json_path = os.path.join(pasta_saida, "dados.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(dados, f, ensure_ascii=False, separators=(",", ":"))
-    tamanhos["JSON"] = os.path.getsize(json_path)
-
-    # --- TOON ---
-    etapa_atual += 1
-    callback(etapa_atual, etapas)
-
-    toon_path = os.path.join(pasta_saida, "dados.toon")
-
-    with open(toon_path, "w", encoding="utf-8") as f:
-        f.write("|".join(dados[0].keys()) + "\n")
-        for linha in dados:
-            f.write("|".join([str(v) for v in linha.values()]) + "\n")
-    tamanhos["TOON"] = os.path.getsize(toon_path)
-
-    return tamanhos
+    tamanhos = {}
+    try:
+        with ThreadPoolExecutor(max_workers=etapas) as ex:
+            futuros = {ex.submit(_gravar, fn, colunas, temporarios[nome]): nome
+                       for nome, _, fn in ESCRITORES}
+            for etapa_atual, futuro in enumerate(as_completed(futuros), start=1):
+                tamanhos[futuros[futuro]] = futuro.result()
+                callback(etapa_atual, etapas)
+    except Exception:
+        for temporario in temporarios.values():
+            if os.path.exists(temporario):
+                os.remove(temporario)
+        raise
+
+    for nome, arquivo, _ in ESCRITORES:
+        os.replace(temporarios[nome], os.path.join(pasta_saida, arquivo))
+
+    # Mantém a ordem SQLite, CSV, JSON, TOON na mensagem final
+    return {nome: tamanhos[nome] for nome, _, _ in ESCRITORES}
 
 
 # -------------------------------------------------------
@@ -108,7 +190,13 @@ class App(tb.Window):
         self.qtd_var = tk.IntVar(value=1000)
         self.pasta_var = tk.StringVar()
 
+        # Atualizações pendentes vindas da thread de geração
+        self._pending_pct = None
+        self._pending_status = None
+        self._pending_msg = None
+
         self._build_ui()
+        self.after(50, self._drain_progress)
 
     def _build_ui(self):
         frame = ttk.Frame(self, padding=15)
@@ -146,40 +234,58 @@ class App(tb.Window):
     # ---------------- THREAD -------------------
 
     def iniciar_thread(self):
+        # Entradas lidas aqui, na thread da interface
+        try:
+            qtd = self.qtd_var.get()
+        except tk.TclError:
+            qtd = 0
+        if qtd <= 0:
+            messagebox.showerror("Erro", "A quantidade deve ser maior que zero.")
+            return
+
+        pasta = self.pasta_var.get()
+        if not pasta:
+            messagebox.showerror("Erro", "Selecione a pasta de saída.")
+            return
+
         self.progresso["value"] = 0
-        thread = threading.Thread(target=self.gerar, daemon=True)
+        self.status.config(text="Gerando dados...")
+        thread = threading.Thread(target=self.gerar, args=(qtd, pasta), daemon=True)
         thread.start()
 
     # -------- callback do progresso ----------
+    # A thread de trabalho só guarda o valor mais recente; quem mexe nos
+    # widgets é _drain_progress, que roda na thread da interface.
     def atualizar_barra(self, etapa, total):
-        pct = (etapa / total) * 100
-        self.progresso["value"] = pct
-        self.status.config(text=f"Progresso: {pct:.1f}%")
-        self.update_idletasks()
+        self._pending_pct = (etapa / total) * 100
 
-    def gerar(self):
-        try:
-            qtd = self.qtd_var.get()
-            if qtd <= 0:
-                messagebox.showerror("Erro", "A quantidade deve ser maior que zero.")
-                return
+    def _drain_progress(self):
+        pct, self._pending_pct = self._pending_pct, None
+        if pct is not None:
+            self.progresso["value"] = pct
+            self.status.config(text=f"Progresso: {pct:.1f}%")
 
-            pasta = self.pasta_var.get()
-            if not pasta:
-                messagebox.showerror("Erro", "Selecione a pasta de saída.")
-                return
+        texto, self._pending_status = self._pending_status, None
+        if texto is not None:
+            self.status.config(text=texto)
+
+        msg, self._pending_msg = self._pending_msg, None
+        if msg is not None:
+            mostrar, titulo, corpo = msg
+            mostrar(titulo, corpo)
 
-            self.status.config(text="Gerando dados...")
-            self.update_idletasks()
+        self.after(50, self._drain_progress)
 
+    def gerar(self, qtd, pasta):
+        try:
             # Progresso da geração de dados
-            dados = gerar_dados(qtd, callback=self.atualizar_barra)
+            colunas = gerar_dados(qtd, callback=self.atualizar_barra)
 
             # Progresso da exportação
             def callback_export(etapa, total):
                 self.atualizar_barra(etapa + qtd, total + qtd)
 
-            tamanhos = exportar_todos(dados, pasta, callback_export)
+            tamanhos = exportar_todos(colunas, pasta, callback_export)
 
             # Montar mensagem de tamanho
             texto = "Tamanhos gerados:\n"
@@ -187,15 +293,12 @@ class App(tb.Window):
                 mb = bytes_ / (1024 * 1024)
                 texto += f"{nome}: {mb:.2f} MB  "
 
-            self.status.config(text=texto)
-
-            self.progresso["value"] = 100
-
-            messagebox.showinfo("OK", "Arquivos gerados com sucesso!")
+            self._pending_pct = 100
+            self._pending_status = texto
+            self._pending_msg = (messagebox.showinfo, "OK", "Arquivos gerados com sucesso!")
 
         except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
+            self._pending_msg = (messagebox.showerror, "Erro", str(e))
 
 if __name__ == "__main__":
     App().mainloop()
@@ -3,26 +3,371 @@ from ttkbootstrap.constants import *
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import threading
+import gc
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import time
 import os
-import json
+import csv
+import re
+import hashlib
+import tempfile
+import mmap
+from pathlib import Path
+import orjson
 import sqlite3
+import numpy as np
 import pandas as pd
-import psutil, os
 
-def medir_ram():
-    processo = psutil.Process(os.getpid())
-    return processo.memory_info().rss  # RAM em bytes
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pacsv
+    from pyarrow import feather as pafeather
+except ImportError:  # pyarrow é opcional: sem ele o pandas faz a leitura
+    pa = None
+
+try:
+    import adbc_driver_sqlite.dbapi as adbc_sqlite
+except ImportError:  # opcional: SQLite -> Arrow direto, sem passar pelo pandas
+    adbc_sqlite = None
+
+def medir_ram(df):
+    # RAM ocupada pelo DataFrame carregado, em bytes. A variação de RSS de um
+    # processo do pool não serve: a memória liberada por leituras anteriores
+    # é reaproveitada e as leituras seguintes mediriam quase zero
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+# Insere várias linhas numa Treeview com um único comando Tcl; as linhas
+# chegam como lista Tcl (tupla Python), então não há escape de texto.
+# O id de cada item é a posição da linha no DataFrame (0, 1, 2, ...)
+_TCL_FILL_PROC = '''
+proc ::benchmark_fill {tv rows} {
+    set i 0
+    foreach vals $rows { $tv insert {} end -id $i -values $vals; incr i }
+}
+'''
+
+
+_to_str = np.frompyfunc(str, 1, 1)
+_str_len = np.frompyfunc(len, 1, 1)
+
+
+def _shortify_block(rows):
+    # Texto de cada célula de um bloco 2D, '' para ausentes e corte em
+    # 200 caracteres
+    text = _to_str(rows)
+    text[pd.isna(rows)] = ''
+    long = _str_len(text).astype(np.int64) > 200
+    text[long] = [s[:197] + '...' for s in text[long]]
+    return text
+
+
+def _escape_regex(term):
+    # escapa só os metacaracteres, aceito tanto pelo re do Python quanto
+    # pelo RE2 usado no pyarrow
+    return re.sub(r'([\\^$.|?*+()\[\]{}])', r'\\\1', term)
+
+
+def _text_arrays(df):
+    # Cada coluna como texto em Arrow, com o mesmo texto que a tabela mostra
+    # (ausentes ficam nulos). Só texto e inteiros passam pelo cast do Arrow:
+    # para float e bool ele escreve '1' e 'true', enquanto a tabela mostra
+    # str() ('1.0', 'True')
+    arrays = []
+    for name in df.columns:
+        col = None
+        try:
+            arr = pa.array(df[name], from_pandas=True)
+            if (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)
+                    or pa.types.is_integer(arr.type)):
+                col = pc.cast(arr, pa.string())
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass
+        if col is None:
+            col = pa.array(df[name].astype(str).to_numpy(dtype=object), type=pa.string(),
+                           mask=df[name].isna().to_numpy(dtype=bool))
+        arrays.append(col)
+    return arrays
+
+
+def _search_table(df):
+    # Cópia em Arrow de todas as colunas como texto, feita uma vez por
+    # carregamento para que a busca só varra buffers de string
+    if pa is None:
+        return None
+    return pa.Table.from_arrays(_text_arrays(df), names=[str(c) for c in df.columns])
+
+
+def _search_haystack(df, arrow):
+    # Uma string por linha com todas as colunas, em minúsculas e separadas
+    # por \x1f (o termo não "atravessa" colunas)
+    if arrow is not None and arrow.num_columns:
+        joined = pc.binary_join_element_wise(
+            *arrow.columns, '\x1f', null_handling='replace', null_replacement=''
+        )
+        return pc.utf8_lower(joined)
+    rows = df.astype(str).itertuples(index=False, name=None)
+    return pd.Series(list(map('\x1f'.join, rows)), dtype=object).str.lower()
+
+
+# -------------------------------------------------------
+# Leitura dos arquivos (roda nos processos do ProcessPoolExecutor)
+# -------------------------------------------------------
+def _load_sqlite(path, table):
+    # identificador entre aspas (aspas internas duplicadas)
+    sql = 'SELECT * FROM "{}"'.format(table.replace('"', '""'))
+    if adbc_sqlite is not None:
+        # resultado inteiro como tabela Arrow numa única transferência
+        try:
+            with adbc_sqlite.connect(path) as aconn, aconn.cursor() as acur:
+                acur.execute(sql)
+                return acur.fetch_arrow_table().to_pandas(self_destruct=True)
+        except (adbc_sqlite.Error, OSError):
+            # colunas com tipos mistos (tipagem dinâmica do SQLite) não cabem
+            # num tipo Arrow fixo: o sqlite3 abaixo lê a tabela normalmente
+            pass
+    # somente leitura, cache de páginas maior e leitura via mmap
+    conn = sqlite3.connect(Path(path).resolve().as_uri() + '?mode=ro', uri=True)
+    conn.executescript(
+        "PRAGMA cache_size=-200000;"
+        "PRAGMA mmap_size=268435456;"
+        "PRAGMA temp_store=MEMORY;"
+    )
+    kwargs = {'dtype_backend': 'pyarrow'} if pa is not None else {}
+    df = pd.read_sql_query(sql, conn, **kwargs)
+    conn.close()
+    return df
+
+
+def _load_csv(path, table=None):
+    if pa is not None:
+        # leitor CSV do Arrow: multithread, blocos de 8 MiB; as
+        # colunas continuam em buffers Arrow (pd.ArrowDtype)
+        return pacsv.read_csv(
+            path, read_options=pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+        ).to_pandas(types_mapper=pd.ArrowDtype, use_threads=True, self_destruct=True)
+    return pd.read_csv(path, engine='c', low_memory=False)
+
+
+def _load_json(path, table=None):
+    # parser em C direto sobre o arquivo mapeado em memória (sem cópia
+    # para um objeto bytes nem decodificação antes)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        with memoryview(mm) as view:
+            data = orjson.loads(view)
+    if not isinstance(data, list):
+        return pd.json_normalize(data)
+    if pa is not None and data and isinstance(data[0], dict):
+        # lista de registros -> tabela Arrow (tipos inferidos em C,
+        # com as chaves de todos os registros)
+        try:
+            tbl = pa.Table.from_struct_array(pa.array(data))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            # tipos mistos numa coluna ou inteiros acima do int64: o pandas resolve
+            return pd.DataFrame(data)
+        # registros com objetos ou listas dentro: json_normalize achata
+        if any(pa.types.is_nested(t) for t in tbl.schema.types):
+            return pd.json_normalize(data)
+        return tbl.to_pandas(types_mapper=pd.ArrowDtype)
+    return pd.DataFrame(data)
+
+
+def _load_toon(path, table=None):
+    if pa is None:
+        # separação por '|' feita pelo parser C do pandas; a primeira
+        # linha é o cabeçalho, tudo é texto (sem aspas nem NaN), e
+        # utf-8-sig descarta o BOM
+        return pd.read_csv(
+            path, sep='|', engine='c', encoding='utf-8-sig',
+            dtype=str, na_filter=False, quoting=csv.QUOTE_NONE,
+        )
+    # Cabeçalho lido à parte (utf-8-sig descarta o BOM); o corpo vai para o
+    # leitor CSV do Arrow com '|' e sem aspas, todas as colunas como texto.
+    # As colunas ficam em buffers Arrow (pd.ArrowDtype), sem um objeto str
+    # do Python por célula. O arquivo é lido via mmap
+    with open(path, 'rb') as f:
+        header = f.readline().decode('utf-8-sig').strip().split('|')
+    with pa.memory_map(path) as source:
+        tbl = pacsv.read_csv(
+            source,
+            read_options=pacsv.ReadOptions(
+                use_threads=True, block_size=8 << 20, column_names=header, skip_rows=1,
+            ),
+            parse_options=pacsv.ParseOptions(delimiter='|', quote_char=False),
+            convert_options=pacsv.ConvertOptions(
+                column_types={name: pa.string() for name in header}, strings_can_be_null=False,
+            ),
+        )
+    return tbl.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+
+
+# Um leitor por formato, todos com a mesma assinatura (path, table); só o
+# SQLite usa a tabela. Funções de módulo para poderem ir ao ProcessPool
+_LOADERS = {
+    'sqlite': _load_sqlite,
+    'csv': _load_csv,
+    'json': _load_json,
+    'toon': _load_toon,
+}
+
+
+def _cache_dir():
+    base = (os.environ.get('XDG_CACHE_HOME') or os.environ.get('LOCALAPPDATA')
+            or os.path.join(os.path.expanduser('~'), '.cache'))
+    return Path(base) / 'benchmark-de-desempenho'
+
+
+def _cache_file(fmt_key, path, table):
+    # Nome '<origem>-<versão>.feather': a origem é (arquivo, formato, tabela)
+    # e a versão muda se o arquivo for alterado (mtime/tamanho)
+    st = os.stat(path)
+    origem = f'{os.path.abspath(path)}|{fmt_key}|{table}'
+    versao = f'{st.st_mtime_ns}|{st.st_size}'
+    origem = hashlib.blake2b(origem.encode(), digest_size=16).hexdigest()
+    versao = hashlib.blake2b(versao.encode(), digest_size=8).hexdigest()
+    return _cache_dir() / f'{origem}-{versao}.feather'
+
+
+def _read_cache(cache_file):
+    # leitura do Feather já convertido, independente do formato original;
+    # entrada ilegível (ex.: truncada) é apagada e o arquivo é lido de novo
+    try:
+        return _arrow_to_pandas(pafeather.read_table(cache_file))
+    except (OSError, pa.ArrowException):
+        try:
+            cache_file.unlink(missing_ok=True)
+        except OSError:
+            pass
+        return None
+
+
+def _write_cache(cache_file, df):
+    tmp = None
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # nome temporário único: dois carregamentos do mesmo arquivo podem
+        # gravar o cache ao mesmo tempo
+        fd, tmp = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+        os.close(fd)
+        df.to_feather(tmp, compression='lz4')
+        os.replace(tmp, cache_file)
+        tmp = None
+        # versões antigas do mesmo arquivo (ex.: regerado pelo bd.py) saem do cache
+        origem = cache_file.stem.split('-')[0]
+        for antigo in cache_file.parent.glob(f'{origem}-*.feather'):
+            if antigo != cache_file:
+                antigo.unlink(missing_ok=True)
+    except (OSError, ValueError, pa.ArrowException):
+        pass  # sem cache para este arquivo; o carregamento segue normal
+    finally:
+        if tmp is not None:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
 
+def _parse_file(fmt_key, path, table=None, use_cache=False):
+    loader = _LOADERS.get(fmt_key)
+    if loader is None:
+        raise RuntimeError('Formato não suportado')
+    # Tempo medido aqui, no processo que lê, sem contar a transferência
+    cache_file = _cache_file(fmt_key, path, table) if use_cache and pa is not None else None
+    cached = cache_file is not None and cache_file.exists()
+    t0 = time.perf_counter()
+    df = _read_cache(cache_file) if cached else None
+    if df is None:
+        # sem cache (ou cache descartado): medição recomeça na leitura original
+        cached = False
+        t0 = time.perf_counter()
+        df = loader(path, table)
+
+    t1 = time.perf_counter()
+    elapsed = round(t1 - t0, 4)
+    ram_mb = medir_ram(df) / 1024 / 1024
+    if cache_file is not None and not cached:
+        _write_cache(cache_file, df)
+    return _pack_payload(df), elapsed, ram_mb, cached, _fingerprint(df)
+
+
+def _fingerprint(df):
+    # Resumo do conteúdo sobre o texto de cada célula (nulos viram ''), para
+    # que o mesmo dado lido como número num formato e texto noutro bata.
+    # Independe da ordem das linhas: dois formatos têm o mesmo conteúdo se
+    # os resumos forem iguais
+    if pa is None:
+        text = df.astype(str).mask(df.isna(), '')
+        return np.sort(pd.util.hash_pandas_object(text, index=False).to_numpy())
+    if not len(df.columns):
+        return hashlib.blake2b(str(len(df)).encode(), digest_size=16).hexdigest()
+    # Uma string por linha (colunas separadas por \x1f), ordenada e resumida
+    # com blake2b direto sobre os buffers do Arrow: sem str() por célula
+    cols = [pc.fill_null(col, '') for col in _text_arrays(df)]
+    rows = pc.binary_join_element_wise(*cols, '\x1f')
+    if isinstance(rows, pa.ChunkedArray):
+        rows = rows.combine_chunks()
+    rows = pc.take(rows, pc.sort_indices(rows))
+    offsets = np.frombuffer(rows.buffers()[1], dtype=np.int32)[rows.offset:rows.offset + len(rows) + 1]
+    data = np.frombuffer(rows.buffers()[2], dtype=np.uint8) if len(rows) else np.empty(0, np.uint8)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.diff(offsets).tobytes())
+    h.update(data[offsets[0]:offsets[-1]].tobytes() if len(rows) else b'')
+    return h.hexdigest()
+
+
+def _arrow_to_pandas(tbl):
+    nested = [f.name for f in tbl.schema if pa.types.is_nested(f.type)]
+    if not nested:
+        return tbl.to_pandas()
+    # colunas aninhadas (struct/list) só convertem com pd.ArrowDtype (o
+    # to_pandas padrão não reconhece esses tipos nos metadados do pandas) e
+    # depois voltam a objetos Python: listas e dicts, como o json_normalize
+    # entrega, em vez de ndarrays (que apareceriam como '[1 2]' na tabela)
+    df = tbl.to_pandas(types_mapper=pd.ArrowDtype)
+    for name in nested:
+        df[name] = pd.Series(tbl.column(name).to_pylist(), index=df.index, dtype=object)
+    return df
+
+
+def _pack_payload(df):
+    # Com pyarrow, o DataFrame volta ao processo da UI como stream IPC do
+    # Arrow (buffers contíguos) em vez de pickle objeto a objeto
+    if pa is not None:
+        try:
+            tbl = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            return 'pandas', df
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, tbl.schema) as writer:
+            writer.write_table(tbl)
+        return 'arrow', sink.getvalue()
+    return 'pandas', df
+
+
+def _unpack_payload(payload):
+    (kind, data), elapsed, ram_mb, cached, fingerprint = payload
+    if kind == 'arrow':
+        data = _arrow_to_pandas(pa.ipc.open_stream(data).read_all())
+    return data, elapsed, ram_mb, cached, fingerprint
 
 
 class FormatPanel(ttk.LabelFrame):
-    def __init__(self, master, title, fmt_key, comparator, *args, **kwargs):
+    def __init__(self, master, title, fmt_key, comparator, pool, cache_var, on_pool_broken, *args, **kwargs):
         super().__init__(master, text=title, padding=8, *args, **kwargs)
         self.fmt_key = fmt_key
         self.comparator = comparator
+        self.pool = pool
+        self.cache_var = cache_var
+        self.on_pool_broken = on_pool_broken  # recria o pool se um processo morrer
         self.selected_file = None
         self.df = None
+        self._arrow = None  # colunas como texto (pyarrow) para a busca
+        self._search_haystack = None  # uma string por linha, montada após o load
+        self._load_result = None  # preenchido pela thread de carregamento
+        self._load_gen = 0  # incrementado a cada carregamento e por "Limpar Tudo"
         self._build_ui()
 
     def _build_ui(self):
@@ -66,6 +411,7 @@ class FormatPanel(ttk.LabelFrame):
 
         # tag style for highlights
         self.table.tag_configure('found', background='#fff3a3')
+        self.tk.eval(_TCL_FILL_PROC)
 
     def _append_log(self, txt):
         now = time.strftime('%H:%M:%S')
@@ -93,83 +439,113 @@ class FormatPanel(ttk.LabelFrame):
             messagebox.showwarning('Aviso', 'Selecione um arquivo antes de carregar.')
             return
 
+        path = self.selected_file
+        table = None
+        if self.fmt_key == 'sqlite':
+            # descoberta da tabela (e diálogo, se houver mais de uma) na thread da UI
+            try:
+                table = self._choose_sqlite_table(path)
+            except Exception as e:
+                self._load_failed(path, e)
+                return
+
+        self._append_log(f'Iniciando carregamento ({self.fmt_key})')
         # Mostrar spinner
         self.spinner.place(relx=0.02, rely=0.42, relwidth=0.96)
         self.spinner.start(10)
 
-        threading.Thread(target=self._load_worker, daemon=True).start()
-
-
-    def _load_worker(self):
-        path = self.selected_file
-        self._append_log(f'Iniciando carregamento ({self.fmt_key})')
-        ram_antes = medir_ram()
-        t0 = time.perf_counter()
+        # A leitura roda num processo do pool; a thread só espera o resultado.
+        # Os widgets são atualizados em _poll_load
+        # Cada carregamento tem sua geração; resultados de gerações antigas
+        # (clique duplo ou "Limpar Tudo" no meio) são descartados
+        self._load_gen += 1
+        gen = self._load_gen
+        self._load_result = None
+        use_cache = self.cache_var.get()
+        worker = threading.Thread(target=self._load_worker, args=(gen, path, table, use_cache), daemon=True)
+        worker.start()
+        self.after(50, self._poll_load, gen, worker, path)
+
+    def _load_worker(self, gen, path, table, use_cache):
+        # Espera o processo de leitura e reconstrói o DataFrame fora da UI
+        pool = self.pool
         try:
-            if self.fmt_key == 'sqlite':
-                df = self._load_sqlite(path)
-            elif self.fmt_key == 'csv':
-                df = pd.read_csv(path)
-            elif self.fmt_key == 'json':
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                if isinstance(data, list):
-                    df = pd.DataFrame(data)
-                else:
-                    df = pd.json_normalize(data)
-            elif self.fmt_key == 'toon':
-                with open(path, 'r', encoding='utf-8') as f:
-                    linhas = f.readlines()
-
-                # --- usar a primeira linha como cabeçalho ---
-                header = linhas[0].strip().split('|')
-                dados = [linha.strip().split('|') for linha in linhas[1:]]
-
-                df = pd.DataFrame(dados, columns=header)
-
-
-            else:
-                raise RuntimeError('Formato não suportado')
-
+            payload = pool.submit(_parse_file, self.fmt_key, path, table, use_cache).result()
+            df, elapsed, ram_mb, cached, fingerprint = _unpack_payload(payload)
+        except BrokenProcessPool:
+            # processo de leitura morto (ex.: falta de memória): sem um pool
+            # novo, todo carregamento seguinte falharia nos quatro painéis
+            self.on_pool_broken(pool)
+            result = ('erro', RuntimeError('o processo de leitura foi encerrado '
+                                           '(memória insuficiente?); tente carregar de novo'))
         except Exception as e:
-            self._append_log(f'ERRO ao carregar: {e}')
-            self.df = None
-            self.comparator.record(self.fmt_key, path, None, None)
-            self.spinner.stop()
-            self.spinner.place_forget()
+            result = ('erro', e)
+        else:
+            # fora da medição: colunas de texto para a busca
+            arrow = _search_table(df)
+            result = ('ok', df, elapsed, ram_mb, cached, fingerprint, arrow)
+        if gen == self._load_gen:
+            self._load_result = (gen, result)
+
+    def _poll_load(self, gen, worker, path):
+        if gen != self._load_gen:
+            return  # carregamento substituído ou descartado por "Limpar Tudo"
+        if worker.is_alive():
+            self.after(50, self._poll_load, gen, worker, path)
+            return
 
+        # parar spinner quando terminar
+        self.spinner.stop()
+        self.spinner.place_forget()
+
+        result = self._load_result
+        self._load_result = None
+        if result is None or result[0] != gen:
+            return
+        result = result[1]
+        if result[0] == 'erro':
+            self._load_failed(path, result[1])
             return
 
-        t1 = time.perf_counter()
-        elapsed = round(t1 - t0, 4)
+        _, df, elapsed, ram_mb, cached, fingerprint, arrow = result
         rows = len(df)
-        ram_depois = medir_ram()
-        ram_usada = ram_depois - ram_antes
-        ram_mb = ram_usada / 1024 / 1024
         self.df = df
-        self._append_log(f'Concluído em {elapsed}s — {rows} linhas')
+        self._arrow = arrow
+        self._search_haystack = None
+        origem = ' (cache)' if cached else ''
+        self._append_log(f'Concluído em {elapsed}s{origem} — {rows} linhas')
         self.info_var.set(f'Arquivo: {os.path.basename(path)} | {rows} linhas')
         self._fill_table()
-        self.comparator.record(self.fmt_key, path, elapsed, rows, ram_mb)
-        # parar spinner quando terminar
-        self.spinner.stop()
-        self.spinner.place_forget()
+        threading.Thread(target=self._build_haystack, args=(df, arrow), daemon=True).start()
+        self.comparator.record(self.fmt_key, path, elapsed, rows, ram_mb, cached, fingerprint)
 
-    def _load_sqlite(self, path):
+    def _load_failed(self, path, error):
+        self._append_log(f'ERRO ao carregar: {error}')
+        self.df = None
+        self._arrow = None
+        self._search_haystack = None
+        self.comparator.record(self.fmt_key, path, None, None, None)
+
+    def _choose_sqlite_table(self, path):
         conn = sqlite3.connect(path)
         cur = conn.cursor()
         cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [r[0] for r in cur.fetchall()]
-        if not tables:
-            conn.close()
-            raise RuntimeError('BD SQLite sem tabelas')
-        table = tables[0]
-        if len(tables) > 1:
-            # ask user for table
-            table = self._ask_table_choice(tables)
-        df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+        # no caso comum (uma tabela) bastam duas leituras do cursor
+        first = cur.fetchone()
+        second = cur.fetchone() if first else None
+        tables = None
+        if second:
+            tables = [first[0], second[0]] + [r[0] for r in cur]
         conn.close()
-        return df
+        if not first:
+            raise RuntimeError('BD SQLite sem tabelas')
+        if tables is None:
+            return first[0]
+        # ask user for table
+        table = self._ask_table_choice(tables)
+        if not table:
+            raise RuntimeError('Nenhuma tabela selecionada')
+        return table
 
     def _ask_table_choice(self, tables):
         win = tk.Toplevel(self)
@@ -204,15 +580,44 @@ class FormatPanel(ttk.LabelFrame):
             self.table.column(c, width=140, anchor=CENTER)
 
         # Inserir linhas (limitado para não travar a UI)
-        maxrows = min(len(self.df), 1000)
-        for idx in range(maxrows):
-            vals = [self._shortify(v) for v in self.df.iloc[idx].tolist()]
-            self.table.insert('', 'end', values=vals)
-
-
-    def _shortify(self, v):
-        s = '' if pd.isna(v) else str(v)
-        return s if len(s) <= 200 else s[:197] + '...'
+        # as linhas visíveis viram um único array 2D de objetos
+        rows = self.df.head(1000).to_numpy(dtype=object)
+        vals = tuple(map(tuple, _shortify_block(rows).tolist()))
+        # todas as linhas numa única chamada ao Tcl
+        self.tk.call('::benchmark_fill', str(self.table), vals)
+
+
+    def _build_haystack(self, df, arrow):
+        haystack = _search_haystack(df, arrow)
+        # descarta se outro arquivo foi carregado (ou tudo limpo) nesse meio tempo
+        if self.df is df:
+            self._search_haystack = haystack
+
+    def _search_mask(self, term):
+        # Vários termos separados por '|' viram uma única expressão (alternância
+        # de literais), compilada uma vez e aplicada numa só varredura
+        terms = [t.strip() for t in term.split('|') if t.strip()] or [term]
+        regex = len(terms) > 1
+        pattern = '|'.join(map(_escape_regex, terms)) if regex else terms[0]
+
+        haystack = self._search_haystack
+        if haystack is not None:
+            # uma única coluna já em minúsculas
+            pattern_l = pattern.lower()
+            if isinstance(haystack, pd.Series):
+                return haystack.str.contains(pattern_l, regex=regex).to_numpy()
+            match = pc.match_substring_regex if regex else pc.match_substring
+            return pc.fill_null(match(haystack, pattern_l), False).to_numpy(zero_copy_only=False)
+        if self._arrow is not None:
+            # varredura vetorizada nos buffers de texto do Arrow
+            match = pc.match_substring_regex if regex else pc.match_substring
+            mask = None
+            for col in self._arrow.columns:
+                m = match(col, pattern, ignore_case=True)
+                mask = m if mask is None else pc.or_(mask, m)
+            return pc.fill_null(mask, False).to_numpy(zero_copy_only=False)
+        mask = self.df.apply(lambda col: col.astype(str).str.contains(pattern, case=False, na=False, regex=regex))
+        return mask.any(axis=1).to_numpy()
 
     def search(self):
         if self.df is None:
@@ -224,36 +629,38 @@ class FormatPanel(ttk.LabelFrame):
             return
         t0 = time.perf_counter()
         try:
-            mask = self.df.apply(lambda col: col.astype(str).str.contains(term, case=False, na=False))
-            found = self.df[mask.any(axis=1)]
+            found_idx = np.flatnonzero(self._search_mask(term))
         except Exception as e:
             self._append_log(f'ERRO na busca: {e}')
             return
         t1 = time.perf_counter()
         elapsed = round(t1 - t0, 4)
-        count = len(found)
+        count = len(found_idx)
         self._append_log(f"Busca '{term}' → {count} resultados ({elapsed}s)")
-        self._highlight_found(found)
+        self._highlight_found(found_idx)
 
-    def _highlight_found(self, found_df):
-        # clear tags
-        for item in self.table.get_children():
-            self.table.item(item, tags='')
-        found_set = {tuple(self._shortify(v) for v in row) for row in found_df.values}
-        for item in self.table.get_children():
-            vals = tuple(self.table.item(item)['values'])
-            if vals in found_set:
-                self.table.item(item, tags=('found',))
+    def _highlight_found(self, found_idx):
+        # os ids dos itens são as posições das linhas; limpar e marcar
+        # são um comando Tcl cada
+        tv = str(self.table)
+        children = self.table.get_children()
+        if children:
+            self.tk.call(tv, 'tag', 'remove', 'found', children)
+        visible = found_idx[found_idx < len(children)]
+        if len(visible):
+            self.tk.call(tv, 'tag', 'add', 'found', tuple(map(str, visible.tolist())))
 
 
 class ComparatorPanel(ttk.LabelFrame):
     def __init__(self, master, *args, **kwargs):
         super().__init__(master, text='Comparação', padding=8, *args, **kwargs)
-        self.records = {}  # fmt -> (file, time, rows)
+        self.records = {}  # fmt -> (file, time, rows, ram, cached, size_bytes, fingerprint)
+        self._cold_times = {}  # (fmt, file) -> tempo da última leitura sem cache
+        self._refresh_scheduled = False
         self._build_ui()
 
     def _build_ui(self):
-        cols = ('format', 'file', 'time_s', 'rows', 'ram', 'size', 'speed', 'rank')
+        cols = ('format', 'file', 'time_s', 'rows', 'ram', 'size', 'speed', 'rank', 'match')
         self.table = ttk.Treeview(self, columns=cols, show='headings', height=6)
 
         headers = {
@@ -264,7 +671,8 @@ class ComparatorPanel(ttk.LabelFrame):
             'ram': 'RAM (MB)',
             'size': 'Tamanho',
             'speed': 'Linhas/s',
-            'rank': 'Ranking'
+            'rank': 'Ranking',
+            'match': 'Igual'
         }
 
         for c in cols:
@@ -277,37 +685,78 @@ class ComparatorPanel(ttk.LabelFrame):
 
         self.table.pack(fill=BOTH, expand=True)
 
-    def record(self, fmt_key, file, time_s, rows, ram_mb):
-        self.records[fmt_key] = (file, time_s, rows, ram_mb)
+    def record(self, fmt_key, file, time_s, rows, ram_mb, cached=False, fingerprint=None):
+        # tamanho lido uma vez aqui; _refresh trabalha só com o que está em memória
+        try:
+            size_bytes = os.path.getsize(file) if file else None
+        except OSError:
+            size_bytes = None
+        self.records[fmt_key] = (file, time_s, rows, ram_mb, cached, size_bytes, fingerprint)
+        if time_s is not None and not cached:
+            # último tempo sem cache, exibido ao lado das leituras do cache
+            self._cold_times[(fmt_key, file)] = time_s
+        # vários registros em sequência viram um único _refresh
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.after(100, self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_scheduled = False
         self._refresh()
 
+    def _parse_time(self, fmt, rec):
+        # tempo de leitura do formato em si; para leituras do cache, o último
+        # tempo sem cache do mesmo arquivo (None se nunca houve)
+        file, t, _rows, _ram, cached = rec[:5]
+        if cached:
+            return self._cold_times.get((fmt, file))
+        return t
+
 
     def _refresh(self):
         self.table.delete(*self.table.get_children())
 
-        valid_times = [(fmt, rec[0], rec[1], rec[2]) 
-                       for fmt, rec in self.records.items() if rec[1] is not None]
+        # ranking e Linhas/s pelo tempo sem cache: uma leitura do Feather não
+        # diz nada sobre o formato (leituras do cache sem tempo frio ficam de fora)
+        parse_times = [(fmt, rec[0], self._parse_time(fmt, rec), rec[2])
+                       for fmt, rec in self.records.items()]
+        valid_times = [x for x in parse_times if x[2] is not None]
 
-        if not valid_times:
+        if not self.records:
             return
 
-        fastest = min(valid_times, key=lambda x: x[2])
-        slowest = max(valid_times, key=lambda x: x[2])
         ordered = sorted(valid_times, key=lambda x: x[2])
+        fastest = ordered[0][0] if ordered else None
+        slowest = ordered[-1][0] if ordered else None
         ranking = {fmt: i + 1 for i, (fmt, *_rest) in enumerate(ordered)}
 
+        # conteúdo comparado com o primeiro formato carregado (referência);
+        # self.records guarda a ordem de carregamento (recarregar um formato
+        # não muda sua posição)
+        ref_fmt, ref_fp = None, None
+        for fmt, rec in self.records.items():
+            if rec[6] is not None:
+                ref_fmt, ref_fp = fmt, rec[6]
+                break
+
         for fmt in ('sqlite', 'csv', 'json', 'toon'):
             rec = self.records.get(fmt)
             if not rec:
                 self.table.insert('', 'end', values=(fmt, '', '', '', '', '', ''))
                 continue
 
-            file, t, rows, ram = rec
+            file, t, rows, ram, cached, size_bytes, fingerprint = rec
             filename = os.path.basename(file) if file else ''
 
+            # leituras do cache ficam marcadas, com o tempo original ao lado
+            fmt_str = f"{fmt} (cache)" if cached else fmt
+            t_str = t if t is not None else ''
+            cold = self._cold_times.get((fmt, file))
+            if cached and cold is not None:
+                t_str = f"{t} (sem cache: {cold})"
+
             # tamanho do arquivo
-            if file:
-                size_bytes = os.path.getsize(file)
+            if size_bytes is not None:
                 size_str = (
                     f"{size_bytes/1024:.1f} KB"
                     if size_bytes < 1_000_000 else
@@ -318,19 +767,31 @@ class ComparatorPanel(ttk.LabelFrame):
 
             # velocidade (linhas/seg)
             speed = ''
-            if t and rows:
-                speed = f"{int(rows / t):,}".replace(",", ".")
+            parse_t = self._parse_time(fmt, rec)
+            if parse_t and rows:
+                speed = f"{int(rows / parse_t):,}".replace(",", ".")
 
             # ranking
             rnk = ranking.get(fmt, '')
 
-            row = (fmt, filename, t, rows, f"{ram:.2f} MB", size_str, speed, rnk)
+            ram_str = f"{ram:.2f} MB" if ram is not None else ''
+            rows_str = rows if rows is not None else ''
+
+            # mesmas linhas (em qualquer ordem) que a referência?
+            match = ''
+            if fingerprint is not None:
+                if fmt == ref_fmt:
+                    match = 'ref'
+                else:
+                    match = 'Sim' if np.array_equal(fingerprint, ref_fp) else 'Não'
+
+            row = (fmt_str, filename, t_str, rows_str, ram_str, size_str, speed, rnk, match)
 
             # destaque suave
             tag = ''
-            if fmt == fastest[0]:
+            if fmt == fastest:
                 tag = 'fastest'
-            elif fmt == slowest[0]:
+            elif fmt == slowest:
                 tag = 'slowest'
 
             self.table.insert('', 'end', values=row, tags=(tag,))
@@ -341,6 +802,11 @@ class App(tb.Window):
         super().__init__(themename='solar')
         self.title('Comparator — SQLite | CSV | JSON | TOON')
         self.geometry('1400x800')
+        self.pool = self._new_pool()
+        self._pool_lock = threading.Lock()
+        # cache em disco (Feather) das leituras já feitas; requer pyarrow
+        # desligado por padrão: o benchmark mede a leitura de cada formato
+        self.cache_var = tk.BooleanVar(value=False)
         self._build_ui()
 
     def _build_ui(self):
@@ -356,27 +822,57 @@ class App(tb.Window):
         self.panels = {}
         for title, key in (('SQLite', 'sqlite'), ('CSV', 'csv'), ('JSON', 'json'), ('TOON', 'toon')):
             frame = ttk.Frame(paned)
-            panel = FormatPanel(frame, title, key, self.comparator)
+            panel = FormatPanel(frame, title, key, self.comparator, self.pool, self.cache_var,
+                                self._pool_broken)
             panel.pack(fill=BOTH, expand=True)
             paned.add(frame, weight=1)
             self.panels[key] = panel
 
         # bottom comparison
         self.comparator.pack(fill=X, pady=8)
+        ttk.Checkbutton(
+            main, text='Usar cache de leituras (Feather)', variable=self.cache_var,
+            state=NORMAL if pa is not None else DISABLED,
+        ).pack(anchor=W)
         ttk.Button(main, text="Limpar Tudo", bootstyle=DANGER, command=self.limpar_tudo)\
             .pack(fill=X, pady=(10,5))
 
+    def _new_pool(self):
+        # Processos para a leitura dos arquivos (um por formato). 'spawn'
+        # evita herdar via fork o estado do Tk deste processo
+        return ProcessPoolExecutor(max_workers=4, mp_context=mp.get_context('spawn'))
+
+    def _pool_broken(self, pool):
+        # chamado pelas threads de carregamento; só o primeiro painel que
+        # encontra o pool quebrado o substitui
+        with self._pool_lock:
+            if self.pool is not pool:
+                return
+            pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = self._new_pool()
+            for panel in self.panels.values():
+                panel.pool = self.pool
+
     def run(self):
-        self.mainloop()
+        try:
+            self.mainloop()
+        finally:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
     def limpar_tudo(self):
         # limpar comparador
         self.comparator.records = {}
+        self.comparator._cold_times = {}
         self.comparator._refresh()
 
         # limpar cada painel
         for panel in self.panels.values():
             panel.selected_file = None
             panel.df = None
+            panel._arrow = None
+            panel._search_haystack = None
+            panel._load_result = None
+            panel._load_gen += 1  # resultado de carregamento em andamento é ignorado
 
             # limpar info
             panel.info_var.set("Nenhum arquivo")
@@ -384,8 +880,10 @@ class App(tb.Window):
             # limpar log
             panel.log.delete("1.0", "end")
 
-            # limpar tabela
-            panel.table.delete(*panel.table.get_children())
+            # limpar tabela (todas as linhas num único comando Tcl)
+            children = panel.table.get_children()
+            if children:
+                panel.tk.call(str(panel.table), 'delete', children)
             panel.table['columns'] = []
 
             # parar spinner se estiver ativo
@@ -395,6 +893,10 @@ class App(tb.Window):
             except:
                 pass
 
+        # devolve já a memória dos DataFrames/tabelas Arrow soltos acima,
+        # para a próxima medição partir de perto do mínimo
+        gc.collect()
+
         messagebox.showinfo("Limpo", "Todos os dados foram apagados.")
 
 